@@ -18,14 +18,16 @@ from .models import (
 class UserAdmin(admin.ModelAdmin):
     list_display = ("id", "username", "email", "role", "is_barista", "is_active")
     list_filter = ("role", "is_barista", "is_active")
-    search_fields = ("username", "email")
+    search_fields = ("^username", "^email")
 
 
 @admin.register(Local)
 class LocalAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "type", "owner", "points_rate", "created_at")
+    list_select_related = ("owner",)
     list_filter = ("type", "points_rate")
-    search_fields = ("name", "owner__username", "address")
+    search_fields = ("^name", "^address", "=owner__username")
+    autocomplete_fields = ("owner",)
     readonly_fields = ("created_at", "updated_at")
 
 
@@ -33,36 +35,55 @@ class LocalAdmin(admin.ModelAdmin):
 class TagAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "scope", "created_at")
     list_filter = ("scope",)
-    search_fields = ("name", "slug")
+    search_fields = ("^name", "^slug")
     readonly_fields = ("created_at", "updated_at")
 
 @admin.register(ProductCategory)
 class ProductCategoryAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "local", "tracks_stock", "created_at")
-    list_filter = ("tracks_stock", "local")
-    search_fields = ("name", "local__name")
+    list_select_related = ("local",)
+    list_filter = ("tracks_stock", ("local", admin.RelatedOnlyFieldListFilter))
+    search_fields = ("^name",)
+    autocomplete_fields = ("local",)
     readonly_fields = ("created_at", "updated_at")
 
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "local", "category", "price", "stock", "state", "is_active")
-    list_filter = ("category", "state", "is_active", "local")
-    search_fields = ("name", "local__name")
+    list_select_related = ("local", "category__local")
+    list_filter = (
+        ("category", admin.RelatedOnlyFieldListFilter),
+        "state",
+        "is_active",
+        ("local", admin.RelatedOnlyFieldListFilter),
+    )
+    search_fields = ("^name",)
+    autocomplete_fields = ("local", "category")
     readonly_fields = ("created_at", "updated_at")
 
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
     extra = 0
-    readonly_fields = ("unit_price",)
+    can_delete = False
+    fields = ("product", "quantity", "unit_price")
+    readonly_fields = ("product", "quantity", "unit_price")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("product__category")
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "local", "status", "total", "created_at")
-    list_filter = ("status", "local")
-    search_fields = ("user__username", "local__name")
+    list_select_related = ("user", "local")
+    list_filter = ("status", ("local", admin.RelatedOnlyFieldListFilter))
+    search_fields = ("=pickup_code", "^user__username")
+    autocomplete_fields = ("user", "local")
     readonly_fields = ("created_at", "updated_at", "total")
     inlines = [OrderItemInline]
 
@@ -70,25 +91,33 @@ class OrderAdmin(admin.ModelAdmin):
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
     list_display = ("id", "order", "product", "quantity", "unit_price")
-    search_fields = ("order__id", "product__name")
+    list_select_related = ("order", "product__category")
+    search_fields = ("=order__id", "^product__name")
+    autocomplete_fields = ("order", "product")
 
 
 @admin.register(PointBalance)
 class PointBalanceAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "local", "total", "updated_at")
-    search_fields = ("user__username", "local__name")
-    list_filter = ("local",)
+    list_select_related = ("user", "local")
+    search_fields = ("^user__username",)
+    autocomplete_fields = ("user", "local")
+    list_filter = (("local", admin.RelatedOnlyFieldListFilter),)
 
 
 @admin.register(Reward)
 class RewardAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "local", "points_required", "active")
-    list_filter = ("active", "local")
-    search_fields = ("name", "local__name")
+    list_select_related = ("local",)
+    list_filter = ("active", ("local", admin.RelatedOnlyFieldListFilter))
+    search_fields = ("^name",)
+    autocomplete_fields = ("local",)
 
 
 @admin.register(Redemption)
 class RedemptionAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "local", "points_used", "created_at")
-    search_fields = ("user__username", "local__name", "description")
-    list_filter = ("local",)
+    list_select_related = ("user", "local")
+    search_fields = ("^user__username", "^description")
+    autocomplete_fields = ("user", "local", "reward")
+    list_filter = (("local", admin.RelatedOnlyFieldListFilter),)
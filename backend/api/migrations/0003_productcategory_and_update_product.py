@@ -1,8 +1,13 @@
+from collections import defaultdict
+
 from django.db import migrations, models
 import django.db.models.deletion
 from django.utils.text import slugify
 
 
+BATCH_SIZE = 2000
+
+
 def seed_categories(apps, schema_editor):
     ProductCategory = apps.get_model("api", "ProductCategory")
     Product = apps.get_model("api", "Product")
@@ -12,43 +17,65 @@ def seed_categories(apps, schema_editor):
         "grano": {"name": "Granos", "tracks_stock": True},
     }
 
-    category_cache = {}
+    category_cache = {
+        category.slug: category
+        for category in ProductCategory.objects.filter(local__isnull=True)
+    }
 
     for slug, cfg in defaults.items():
-        category_cache[slug], _ = ProductCategory.objects.get_or_create(
-            slug=slug,
-            local=None,
-            defaults={
-                "name": cfg["name"],
-                "description": "",
-                "tracks_stock": cfg["tracks_stock"],
-            },
-        )
-
-    for product in Product.objects.all():
-        product_type = getattr(product, "product_type", None)
-        if not product_type:
-            continue
+        if slug not in category_cache:
+            category_cache[slug] = ProductCategory.objects.create(
+                slug=slug,
+                local=None,
+                name=cfg["name"],
+                description="",
+                tracks_stock=cfg["tracks_stock"],
+            )
 
+    def resolve_category(product_type):
         category = category_cache.get(product_type)
+        if category is not None:
+            return category
+
+        fallback_slug = slugify(product_type) or "categoria"
+        category = category_cache.get(fallback_slug)
         if category is None:
-            fallback_name = product_type.replace("_", " ").title()
-            fallback_slug = slugify(product_type) or "categoria"
-            category, _ = ProductCategory.objects.get_or_create(
+            category = ProductCategory.objects.create(
                 slug=fallback_slug,
                 local=None,
-                defaults={
-                    "name": fallback_name,
-                    "description": "",
-                    "tracks_stock": False,
-                },
+                name=product_type.replace("_", " ").title(),
+                description="",
+                tracks_stock=False,
             )
-            category_cache[product_type] = category
+            category_cache[fallback_slug] = category
+        category_cache[product_type] = category
+        return category
 
-        product.category = category
+    def flush(category, pks):
+        updates = {"category": category}
         if not category.tracks_stock:
-            product.stock = None
-        product.save(update_fields=["category", "stock"])
+            updates["stock"] = None
+        Product.objects.filter(pk__in=pks).update(**updates)
+        pks.clear()
+
+    pending = defaultdict(list)
+    categories_by_pk = {}
+    products = Product.objects.values_list("id", "product_type").iterator(chunk_size=BATCH_SIZE)
+
+    for product_id, product_type in products:
+        if not product_type:
+            continue
+
+        category = resolve_category(product_type)
+        categories_by_pk[category.pk] = category
+        bucket = pending[category.pk]
+        bucket.append(product_id)
+        if len(bucket) >= BATCH_SIZE:
+            flush(category, bucket)
+
+    for category_pk, pks in pending.items():
+        if pks:
+            flush(categories_by_pk[category_pk], pks)
 
 
 class Migration(migrations.Migration):
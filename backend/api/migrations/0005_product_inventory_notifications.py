@@ -1,41 +1,105 @@
+from collections import defaultdict
+
 from django.conf import settings
 from django.db import migrations, models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
 import django.db.models.deletion
 
 
+BATCH_SIZE = 2000
+
+
+def _supports_update_from_values(connection):
+    # SQLite incorporó ``UPDATE ... FROM`` en 3.33; Django 5.1 admite desde 3.31.
+    if connection.vendor == "postgresql":
+        return True
+    return connection.vendor == "sqlite" and connection.Database.sqlite_version_info >= (3, 33)
+
+
+def _batch_size(connection):
+    # Cada fila usa hasta tres parámetros (``pk__in`` más el par del ``When``).
+    max_params = connection.features.max_query_params
+    if max_params is None:
+        return BATCH_SIZE
+    return max(1, min(BATCH_SIZE, max_params // 3))
+
+
+def _update_display_order(Product, connection, positions):
+    if not _supports_update_from_values(connection):
+        Product.objects.filter(pk__in=list(positions)).update(
+            display_order=Case(
+                *[When(pk=pk, then=Value(position)) for pk, position in positions.items()],
+                default=F("display_order"),
+                output_field=models.PositiveIntegerField(),
+            )
+        )
+        return
+
+    table = connection.ops.quote_name(Product._meta.db_table)
+    rows = ", ".join(["(%s, %s)"] * len(positions))
+    params = [value for row in positions.items() for value in row]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH v(id, display_order) AS (VALUES {rows}) "
+            f"UPDATE {table} SET display_order = v.display_order "
+            f"FROM v WHERE {table}.id = v.id",
+            params,
+        )
+
+
+def _flush_inventory_page(Product, connection, page):
+    buckets = defaultdict(list)
+    positions = {}
+    for pk, tracks_stock, in_stock, position in page:
+        buckets[(tracks_stock, in_stock)].append(pk)
+        positions[pk] = position
+
+    for (tracks_stock, in_stock), pks in buckets.items():
+        Product.objects.filter(pk__in=pks).update(
+            tracks_stock=tracks_stock,
+            stock=Coalesce(F("stock"), Value(0), output_field=models.PositiveIntegerField()),
+            low_stock_threshold=5 if tracks_stock else 0,
+            critical_stock_threshold=0,
+            in_stock=in_stock,
+        )
+    _update_display_order(Product, connection, positions)
+    page.clear()
+
+
 def populate_product_inventory(apps, schema_editor):
     Product = apps.get_model("api", "Product")
+    ProductCategory = apps.get_model("api", "ProductCategory")
+    tracks_map = dict(ProductCategory.objects.values_list("id", "tracks_stock"))
+    batch_size = _batch_size(schema_editor.connection)
     products = (
-        Product.objects.select_related("category")
-        .order_by("category_id", "created_at", "id")
+        Product.objects.order_by("category_id", "created_at", "id")
+        .values_list("id", "category_id", "stock", "in_stock")
+        .iterator(chunk_size=batch_size)
     )
 
     category_counters = {}
+    page = []
 
-    for product in products:
-        category_key = product.category_id or 0
+    for product_id, category_id, stock, in_stock in products:
+        category_key = category_id or 0
         position = category_counters.get(category_key, 0)
         category_counters[category_key] = position + 1
 
-        tracks_stock = True
-        if product.category_id and hasattr(product, "category"):
-            tracks_stock = getattr(product.category, "tracks_stock", True)
+        tracks_stock = tracks_map.get(category_id, True)
 
-        stock_value = product.stock or 0
-        in_stock = product.in_stock
+        stock_value = stock or 0
         if tracks_stock:
             in_stock = stock_value > 0
         elif in_stock is None:
             in_stock = True
 
-        Product.objects.filter(pk=product.pk).update(
-            tracks_stock=tracks_stock,
-            stock=stock_value,
-            low_stock_threshold=5 if tracks_stock else 0,
-            critical_stock_threshold=0,
-            display_order=position,
-            in_stock=in_stock,
-        )
+        page.append((product_id, tracks_stock, in_stock, position))
+        if len(page) >= batch_size:
+            _flush_inventory_page(Product, schema_editor.connection, page)
+
+    if page:
+        _flush_inventory_page(Product, schema_editor.connection, page)
 
 
 class Migration(migrations.Migration):
@@ -1,44 +1,79 @@
+from collections import defaultdict
+
 from django.db import migrations, models
 import django.db.models.deletion
 from django.utils.text import slugify
 
 
+BATCH_SIZE = 2000
+
+
 def migrate_global_categories(apps, schema_editor):
     ProductCategory = apps.get_model("api", "ProductCategory")
     Product = apps.get_model("api", "Product")
 
-    global_categories = ProductCategory.objects.filter(local__isnull=True).order_by("id")
+    global_categories = list(ProductCategory.objects.filter(local__isnull=True).order_by("id"))
+    if not global_categories:
+        return
+
+    products = (
+        Product.objects.filter(
+            category_id__in=[category.pk for category in global_categories],
+            local__isnull=False,
+        )
+        .order_by("category_id", "id")
+        .values_list("id", "category_id", "local_id")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    products_per_local = defaultdict(lambda: defaultdict(list))
+    for product_id, category_id, local_id in products:
+        products_per_local[category_id][local_id].append(product_id)
+
+    existing_slugs = set(
+        ProductCategory.objects.filter(local__isnull=False).values_list("local_id", "slug")
+    )
+    to_create = []
+    product_groups = []
 
     for category in global_categories:
-        products = Product.objects.filter(category=category).select_related("local")
-        created_per_local = {}
-
-        for product in products:
-            local = product.local
-            if local is None:
-                continue
-
-            local_key = local.pk
-            if local_key not in created_per_local:
-                base_slug = category.slug or slugify(category.name) or "categoria"
-                slug = base_slug
-                index = 1
-                while ProductCategory.objects.filter(local=local, slug=slug).exists():
-                    slug = f"{base_slug}-{index}"
-                    index += 1
-
-                created_per_local[local_key] = ProductCategory.objects.create(
+        base_slug = category.slug or slugify(category.name) or "categoria"
+        for local_id, product_ids in products_per_local[category.pk].items():
+            slug = base_slug
+            index = 1
+            while (local_id, slug) in existing_slugs:
+                slug = f"{base_slug}-{index}"
+                index += 1
+            existing_slugs.add((local_id, slug))
+
+            to_create.append(
+                ProductCategory(
                     name=category.name,
                     slug=slug,
                     description=category.description,
                     tracks_stock=category.tracks_stock,
-                    local=local,
+                    local_id=local_id,
                 )
+            )
+            product_groups.append(product_ids)
+
+    created = ProductCategory.objects.bulk_create(to_create, batch_size=500)
+    if schema_editor.connection.features.can_return_rows_from_bulk_insert:
+        category_ids = [category.pk for category in created]
+    else:
+        # Sin RETURNING (SQLite < 3.35) ``bulk_create`` no asigna pk: se releen
+        # las filas nuevas por su par único (local, slug).
+        pk_by_key = {
+            (local_id, slug): pk
+            for local_id, slug, pk in ProductCategory.objects.filter(
+                local_id__in={category.local_id for category in created}
+            ).values_list("local_id", "slug", "pk")
+        }
+        category_ids = [pk_by_key[(category.local_id, category.slug)] for category in created]
 
-            product.category = created_per_local[local_key]
-            product.save(update_fields=["category"])
+    for category_id, product_ids in zip(category_ids, product_groups):
+        Product.objects.filter(pk__in=product_ids).update(category_id=category_id)
 
-        category.delete()
+    ProductCategory.objects.filter(pk__in=[category.pk for category in global_categories]).delete()
 
 
 def reverse_migrate_global_categories(apps, schema_editor):
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_tag_local_amenities_note_local_contact_email_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['local', '-created_at'], name='api_notif_local_ct'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['local', 'status', '-created_at'], name='api_order_local_status_ct'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['local', 'is_active', 'category'], name='api_prod_loc_active_cat'),
+        ),
+    ]
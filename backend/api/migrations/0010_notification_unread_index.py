@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_admin_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['local', '-created_at'], name='api_notif_unread_ct'),
+        ),
+    ]
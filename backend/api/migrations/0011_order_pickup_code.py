@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:26
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_notification_unread_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='pickup_code',
+            field=models.CharField(blank=True, db_index=True, default=api.models.generate_pickup_code, max_length=12),
+        ),
+        migrations.AddConstraint(
+            model_name='order',
+            constraint=models.UniqueConstraint(condition=models.Q(('pickup_code', ''), _negated=True), fields=('local', 'pickup_code'), name='uq_order_local_pickup'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:26
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_order_pickup_code'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='product',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='redemption',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='reward',
+            options={},
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:34
+
+from django.db import migrations, models
+from django.db.models.lookups import LessThanOrEqual
+
+
+def backfill_stock_state(apps, schema_editor):
+    Product = apps.get_model("api", "Product")
+    Product.objects.update(
+        stock_state=models.Case(
+            models.When(tracks_stock=False, in_stock=True, then=models.Value("available")),
+            models.When(tracks_stock=False, then=models.Value("out")),
+            models.When(stock__lte=0, then=models.Value("out")),
+            models.When(
+                LessThanOrEqual(models.F("stock"), models.F("critical_stock_threshold")),
+                then=models.Value("critical"),
+            ),
+            models.When(
+                LessThanOrEqual(models.F("stock"), models.F("low_stock_threshold")),
+                then=models.Value("low"),
+            ),
+            default=models.Value("normal"),
+            output_field=models.CharField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_drop_default_ordering'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='stock_state',
+            field=models.CharField(choices=[('normal', 'Normal'), ('low', 'Stock bajo'), ('critical', 'Stock crítico'), ('out', 'Agotado'), ('available', 'Disponible')], db_index=True, default='normal', editable=False, max_length=16),
+        ),
+        migrations.RunPython(backfill_stock_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_product_stock_state'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['local', '-created_at'], name='api_order_local_ct'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-created_at'], name='api_order_user_ct'),
+        ),
+    ]
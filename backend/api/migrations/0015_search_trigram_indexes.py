@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Las búsquedas de la API usan ``icontains``; en PostgreSQL Django lo traduce a
+# ``UPPER(columna) LIKE UPPER(%s)``, que sólo puede usar un índice GIN trigram
+# sobre la misma expresión. En SQLite (desarrollo) no se crea nada.
+TRIGRAM_INDEXES = (
+    ("api_product_name_trgm", "api_product", "name"),
+    ("api_product_description_trgm", "api_product", "description"),
+    ("api_user_username_trgm", "api_user", "username"),
+    ("api_order_pickup_code_trgm", "api_order", "pickup_code"),
+    ("api_reward_name_trgm", "api_reward", "name"),
+    ("api_reward_description_trgm", "api_reward", "description"),
+    ("api_redemption_description_trgm", "api_redemption", "description"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING gin (UPPER("{column}") gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_order_history_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
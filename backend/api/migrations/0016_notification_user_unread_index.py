@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user'], name='api_notif_user_unread'),
+        ),
+    ]
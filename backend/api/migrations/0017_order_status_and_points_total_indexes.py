@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_notification_user_unread_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'created_at'], name='api_order_status_ct'),
+        ),
+        migrations.AddIndex(
+            model_name='pointbalance',
+            index=models.Index(fields=['local', '-total'], name='api_points_local_total'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-15 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_order_status_and_points_total_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_categor_6f4b32_idx',
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'display_order', 'name'], name='api_prod_cat_order_name'),
+        ),
+    ]
@@ -1,10 +1,13 @@
+import secrets
 from decimal import Decimal
+from functools import lru_cache
 from typing import Optional
 
-from django.apps import apps
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator
-from django.db import models, transaction
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.functions import Greatest
+from django.db.models.lookups import LessThanOrEqual
 from django.utils import timezone
 from django.utils.text import slugify
 
@@ -21,6 +24,8 @@ class User(AbstractUser):
     avatar_url = models.URLField(blank=True, null=True)
     reputation_score = models.FloatField(default=0)
     is_barista = models.BooleanField(default=False)
+    # Cambia con el perfil (no con ``last_login``); invalida los listados que muestran el nombre.
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
@@ -78,6 +83,23 @@ class Local(models.Model):
         return f"{self.name} ({self.get_type_display()})"
 
 
+@lru_cache(maxsize=4096)
+def cached_slugify(value: str) -> str:
+    """``slugify`` memoizado: los nombres de categorías y etiquetas se repiten mucho."""
+
+    return slugify(value)
+
+
+def _allocate_slug(base_slug: str, queryset) -> str:
+    taken = set(queryset.filter(slug__startswith=base_slug).values_list("slug", flat=True))
+    slug = base_slug
+    index = 1
+    while slug in taken:
+        index += 1
+        slug = f"{base_slug}-{index}"
+    return slug
+
+
 class Tag(models.Model):
     class Scopes(models.TextChoices):
         GENERAL = "general", "General"
@@ -101,13 +123,8 @@ class Tag(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.name) or "etiqueta"
-            slug = base_slug
-            index = 1
-            while Tag.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                index += 1
-                slug = f"{base_slug}-{index}"
-            self.slug = slug
+            base_slug = cached_slugify(self.name) or "etiqueta"
+            self.slug = _allocate_slug(base_slug, Tag.objects.exclude(pk=self.pk))
         super().save(*args, **kwargs)
 
 
@@ -133,13 +150,11 @@ class ProductCategory(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.name) or "categoria"
-            slug = base_slug
-            index = 1
-            while ProductCategory.objects.filter(local=self.local, slug=slug).exclude(pk=self.pk).exists():
-                index += 1
-                slug = f"{base_slug}-{index}"
-            self.slug = slug
+            base_slug = cached_slugify(self.name) or "categoria"
+            self.slug = _allocate_slug(
+                base_slug,
+                ProductCategory.objects.filter(local=self.local).exclude(pk=self.pk),
+            )
         super().save(*args, **kwargs)
 
 
@@ -150,6 +165,13 @@ class Product(models.Model):
         FRESH = "recien_tostado", "Recién Tostado"
         PROMO = "promocion", "En Promoción"
 
+    class StockStates(models.TextChoices):
+        NORMAL = "normal", "Normal"
+        LOW = "low", "Stock bajo"
+        CRITICAL = "critical", "Stock crítico"
+        OUT = "out", "Agotado"
+        AVAILABLE = "available", "Disponible"
+
     local = models.ForeignKey(Local, on_delete=models.CASCADE, related_name="products")
     name = models.CharField(max_length=120)
     description = models.TextField(blank=True)
@@ -165,6 +187,13 @@ class Product(models.Model):
     critical_stock_threshold = models.PositiveIntegerField(default=0)
     display_order = models.PositiveIntegerField(default=0)
     in_stock = models.BooleanField(default=True)
+    stock_state = models.CharField(
+        max_length=16,
+        choices=StockStates.choices,
+        default=StockStates.NORMAL,
+        db_index=True,
+        editable=False,
+    )
     state = models.CharField(max_length=20, choices=States.choices, default=States.STANDARD)
     is_active = models.BooleanField(default=True)
     image_url = models.URLField(blank=True, null=True)
@@ -174,44 +203,92 @@ class Product(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["category", "display_order", "name"]
         indexes = [
-            models.Index(fields=["category", "display_order"]),
+            # Cubre el orden por defecto del catálogo (category_id, display_order, name).
+            models.Index(fields=["category", "display_order", "name"], name="api_prod_cat_order_name"),
             models.Index(fields=["local", "display_order"]),
+            models.Index(fields=["local", "is_active", "category"], name="api_prod_loc_active_cat"),
         ]
 
     def __str__(self):
         category_name = self.category.name if self.category_id else "Sin categoría"
         return f"{self.name} ({category_name})"
 
-    @property
-    def stock_state(self) -> str:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_stock_state = instance.__dict__.get("stock_state")
+        return instance
+
+    def compute_stock_state(self, stock: Optional[int] = None) -> str:
         if not self.tracks_stock:
-            return "available" if self.in_stock else "out"
-        if self.stock <= 0:
-            return "out"
-        if self.stock <= max(self.critical_stock_threshold, 0):
-            return "critical"
-        if self.stock <= max(self.low_stock_threshold, 0):
-            return "low"
-        return "normal"
+            return self.StockStates.AVAILABLE if self.in_stock else self.StockStates.OUT
+        stock = self.stock if stock is None else stock
+        if stock <= 0:
+            return self.StockStates.OUT
+        if stock <= max(self.critical_stock_threshold, 0):
+            return self.StockStates.CRITICAL
+        if stock <= max(self.low_stock_threshold, 0):
+            return self.StockStates.LOW
+        return self.StockStates.NORMAL
+
+    @classmethod
+    def stock_state_expression(cls, stock=None):
+        """Expresión SQL equivalente a ``compute_stock_state`` para UPDATEs masivos."""
+
+        stock = stock if stock is not None else models.F("stock")
+        return models.Case(
+            models.When(tracks_stock=False, in_stock=True, then=models.Value(cls.StockStates.AVAILABLE)),
+            models.When(tracks_stock=False, then=models.Value(cls.StockStates.OUT)),
+            models.When(LessThanOrEqual(stock, 0), then=models.Value(cls.StockStates.OUT)),
+            models.When(
+                LessThanOrEqual(stock, models.F("critical_stock_threshold")),
+                then=models.Value(cls.StockStates.CRITICAL),
+            ),
+            models.When(
+                LessThanOrEqual(stock, models.F("low_stock_threshold")),
+                then=models.Value(cls.StockStates.LOW),
+            ),
+            default=models.Value(cls.StockStates.NORMAL),
+            output_field=models.CharField(),
+        )
 
     def adjust_stock(self, quantity):
         if not self.tracks_stock:
             return
-        if quantity < 0 and self.stock < abs(quantity):
-            raise ValueError("Stock insuficiente para completar la operación")
-        self.stock = max(self.stock + quantity, 0)
-        self.save(update_fields=["stock", "in_stock", "updated_at"])
+        queryset = Product.objects.filter(pk=self.pk)
+        if quantity < 0:
+            queryset = queryset.filter(stock__gte=-quantity)
+
+        with transaction.atomic():
+            new_stock = models.F("stock") + quantity
+            updated = queryset.update(
+                stock=new_stock,
+                in_stock=models.Case(
+                    models.When(stock__gt=-quantity, then=models.Value(True)),
+                    default=models.Value(False),
+                ),
+                stock_state=self.stock_state_expression(new_stock),
+                updated_at=timezone.now(),
+            )
+            if not updated:
+                raise ValueError("Stock insuficiente para completar la operación")
+
+            self.refresh_from_db(fields=["stock", "in_stock", "stock_state", "updated_at"])
+            previous_state = self.compute_stock_state(self.stock - quantity)
+            current_state = self.stock_state
+            self._loaded_stock_state = current_state
+            if previous_state != current_state:
+                Notification.log_stock_transition(self, previous_state, current_state)
 
     def save(self, *args, **kwargs):
         previous_state = None
         if self.pk:
-            try:
-                previous = Product.objects.get(pk=self.pk)
-                previous_state = previous.stock_state
-            except Product.DoesNotExist:
-                previous_state = None
+            previous_state = getattr(self, "_loaded_stock_state", None)
+            if previous_state is None:
+                previous_state = (
+                    Product.objects.filter(pk=self.pk).values_list("stock_state", flat=True).first()
+                )
 
         self.stock = max(self.stock or 0, 0)
         self.display_order = max(self.display_order or 0, 0)
@@ -226,21 +303,29 @@ class Product(models.Model):
             if self.stock > 0 and not self.in_stock:
                 self.in_stock = True
 
-        super().save(*args, **kwargs)
-
-        try:
-            notification_model = apps.get_model("api", "Notification")
-        except LookupError:
-            notification_model = None
+        current_state = self.compute_stock_state()
+        self.stock_state = current_state
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "stock_state" not in update_fields:
+            kwargs["update_fields"] = {*update_fields, "stock_state"}
 
-        if notification_model is None:
-            return
+        super().save(*args, **kwargs)
 
-        current_state = self.stock_state
+        self._loaded_stock_state = current_state
         if previous_state is None:
-            notification_model.log_product_created(self)
+            Notification.log_product_created(self)
         elif previous_state != current_state:
-            notification_model.log_stock_transition(self, previous_state, current_state)
+            Notification.log_stock_transition(self, previous_state, current_state)
+
+
+PICKUP_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+
+PICKUP_CODE_ATTEMPTS = 5
+
+
+def generate_pickup_code() -> str:
+    return "".join(secrets.choice(PICKUP_CODE_ALPHABET) for _ in range(8))
 
 
 class Order(models.Model):
@@ -251,25 +336,42 @@ class Order(models.Model):
         COMPLETED = "completado", "Completado"
         CANCELLED = "cancelado", "Cancelado"
 
+    STATUS_VALUES = frozenset(Status.values)
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
     local = models.ForeignKey(Local, on_delete=models.CASCADE, related_name="orders")
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     total = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"))
-    pickup_code = models.CharField(max_length=12, blank=True)
+    pickup_code = models.CharField(max_length=12, blank=True, default=generate_pickup_code, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["local", "status", "-created_at"], name="api_order_local_status_ct"),
+            models.Index(fields=["local", "-created_at"], name="api_order_local_ct"),
+            models.Index(fields=["user", "-created_at"], name="api_order_user_ct"),
+            models.Index(fields=["status", "created_at"], name="api_order_status_ct"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["local", "pickup_code"],
+                name="uq_order_local_pickup",
+                condition=~models.Q(pickup_code=""),
+            ),
+        ]
 
     def __str__(self):
         return f"Pedido #{self.id} ({self.get_status_display()})"
 
     def update_status(self, new_status):
-        if new_status not in dict(self.Status.choices):
+        if new_status not in self.STATUS_VALUES:
             raise ValueError("Estado inválido")
+        now = timezone.now()
+        Order.objects.filter(pk=self.pk).update(status=new_status, updated_at=now)
         self.status = new_status
-        self.save(update_fields=["status", "updated_at"])
+        self.updated_at = now
 
 
 class OrderItem(models.Model):
@@ -293,6 +395,9 @@ class PointBalance(models.Model):
 
     class Meta:
         unique_together = ("user", "local")
+        indexes = [
+            models.Index(fields=["local", "-total"], name="api_points_local_total"),
+        ]
         verbose_name = "Balance de puntos"
         verbose_name_plural = "Balances de puntos"
 
@@ -302,8 +407,32 @@ class PointBalance(models.Model):
     def add_points(self, amount):
         if amount < 0:
             raise ValueError("No se pueden añadir puntos negativos")
-        self.total += amount
-        self.save(update_fields=["total", "updated_at"])
+        now = timezone.now()
+        updated = PointBalance.objects.filter(pk=self.pk).update(
+            total=models.F("total") + amount,
+            updated_at=now,
+        )
+        if updated:
+            self.total += amount
+            self.updated_at = now
+
+    @classmethod
+    def apply_delta(cls, user, local, delta: int) -> "PointBalance":
+        """Suma o resta puntos directamente en la base de datos, sin dejar el saldo bajo cero."""
+
+        queryset = cls.objects.filter(user=user, local=local)
+        values = {
+            "total": Greatest(models.F("total") + delta, models.Value(0)),
+            "updated_at": timezone.now(),
+        }
+        with transaction.atomic():
+            if not queryset.update(**values):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(user=user, local=local, total=max(delta, 0))
+                except IntegrityError:
+                    queryset.update(**values)
+        return queryset.select_related("user", "local").get()
 
 
 class Reward(models.Model):
@@ -317,9 +446,6 @@ class Reward(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    class Meta:
-        ordering = ["points_required", "name"]
-
     def __str__(self):
         return f"{self.name} ({self.local.name})"
 
@@ -332,9 +458,6 @@ class Redemption(models.Model):
     description = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
-    class Meta:
-        ordering = ["-created_at"]
-
     def __str__(self):
         return f"Canje {self.points_used} pts por {self.user}"
 
@@ -369,6 +492,19 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["local", "-created_at"], name="api_notif_local_ct"),
+            models.Index(
+                fields=["local", "-created_at"],
+                name="api_notif_unread_ct",
+                condition=models.Q(is_read=False),
+            ),
+            models.Index(
+                fields=["user"],
+                name="api_notif_user_unread",
+                condition=models.Q(is_read=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_type_display()} · {self.title}"
@@ -398,7 +534,7 @@ class Notification(models.Model):
             level=cls.Levels.INFO,
             title="Producto creado",
             message=f"Se añadió {product.name} al catálogo.",
-            local=product.local,
+            local_id=product.local_id,
             product=product,
             payload=cls._default_payload(product),
         )
@@ -410,37 +546,37 @@ class Notification(models.Model):
             level=cls.Levels.INFO,
             title="Producto actualizado",
             message=f"{product.name} se actualizó correctamente.",
-            local=product.local,
+            local_id=product.local_id,
             product=product,
             user=user,
             payload=cls._default_payload(product),
         )
 
     @classmethod
-    def log_stock_transition(cls, product: Product, previous_state: str | None, new_state: str):
+    def build_stock_transition(
+        cls, product: Product, previous_state: str | None, new_state: str
+    ) -> Optional["Notification"]:
         if new_state == "normal" and previous_state in {"low", "critical", "out"}:
-            cls.objects.create(
+            return cls(
                 type=cls.Types.STOCK_RECOVERED,
                 level=cls.Levels.SUCCESS,
                 title="Stock recuperado",
                 message=f"{product.name} volvió a un nivel saludable de stock.",
-                local=product.local,
+                local_id=product.local_id,
                 product=product,
                 payload=cls._default_payload(product),
             )
-            return
 
         if new_state == "available" and previous_state == "out":
-            cls.objects.create(
+            return cls(
                 type=cls.Types.STOCK_RECOVERED,
                 level=cls.Levels.SUCCESS,
                 title="Producto disponible",
                 message=f"{product.name} volvió a estar disponible para la venta.",
-                local=product.local,
+                local_id=product.local_id,
                 product=product,
                 payload=cls._default_payload(product),
             )
-            return
 
         mapping = {
             "low": (
@@ -463,47 +599,142 @@ class Notification(models.Model):
             ),
         }
 
-        if new_state in mapping:
-            type_value, level, title, message = mapping[new_state]
-            cls.objects.create(
-                type=type_value,
-                level=level,
-                title=title,
-                message=message,
-                local=product.local,
-                product=product,
-                payload=cls._default_payload(product),
-            )
+        if new_state not in mapping:
+            return None
+
+        type_value, level, title, message = mapping[new_state]
+        return cls(
+            type=type_value,
+            level=level,
+            title=title,
+            message=message,
+            local_id=product.local_id,
+            product=product,
+            payload=cls._default_payload(product),
+        )
+
+    @classmethod
+    def log_stock_transition(cls, product: Product, previous_state: str | None, new_state: str):
+        notification = cls.build_stock_transition(product, previous_state, new_state)
+        if notification is not None:
+            notification.save()
 
 # Utility transactional helpers -------------------------------------------------
 
 def create_order_with_items(user, local, items_data):
     """Utility to create an order from validated data ensuring stock integrity."""
 
-    with transaction.atomic():
-        order = Order.objects.create(user=user, local=local)
-        total = Decimal("0.00")
-
-        for item in items_data:
-            product = item["product"]
-            quantity = item["quantity"]
+    requested = {}
+    for item in items_data:
+        product = item["product"]
+        if product.tracks_stock:
+            requested[product.pk] = requested.get(product.pk, 0) + item["quantity"]
 
-            if product.tracks_stock:
-                if product.stock < quantity:
-                    raise ValueError("Stock insuficiente para el producto seleccionado")
-                product.stock = max(product.stock - quantity, 0)
-                product.save(update_fields=["stock", "in_stock", "updated_at"])
+    total = sum(
+        (item["product"].price * item["quantity"] for item in items_data),
+        Decimal("0.00"),
+    ).quantize(Decimal("0.01"))
 
-            OrderItem.objects.create(
-                order=order,
-                product=product,
-                quantity=quantity,
-                unit_price=product.price,
+    with transaction.atomic():
+        # FOR NO KEY UPDATE (PostgreSQL) no bloquea los KEY SHARE que toman
+        # los INSERT de OrderItem de otros pedidos que referencian el producto.
+        locking_queryset = Product.objects.select_for_update(
+            no_key=connection.features.has_select_for_no_key_update
+        )
+        locked_products = {
+            product.pk: product
+            for product in locking_queryset.filter(pk__in=sorted(requested)).order_by("pk")
+        }
+        for product_id, quantity in requested.items():
+            product = locked_products.get(product_id)
+            if product is None or product.stock < quantity:
+                raise ValueError("Stock insuficiente para el producto seleccionado")
+
+        transitions = {}
+        for product_id, quantity in requested.items():
+            product = locked_products[product_id]
+            transitions[product_id] = (
+                product.stock_state,
+                product.compute_stock_state(product.stock - quantity),
             )
 
-            total += product.price * quantity
-
-        order.total = total.quantize(Decimal("0.01"))
-        order.save(update_fields=["total", "updated_at"])
+        if requested:
+            now = timezone.now()
+            sufficient_stock = models.Q()
+            for product_id, quantity in requested.items():
+                sufficient_stock |= models.Q(pk=product_id, stock__gte=quantity)
+            updated = Product.objects.filter(sufficient_stock).update(
+                stock=models.Case(
+                    *[
+                        models.When(pk=product_id, then=models.F("stock") - quantity)
+                        for product_id, quantity in requested.items()
+                    ],
+                    default=models.F("stock"),
+                    output_field=models.PositiveIntegerField(),
+                ),
+                in_stock=models.Case(
+                    *[
+                        models.When(pk=product_id, stock__gt=quantity, then=models.Value(True))
+                        for product_id, quantity in requested.items()
+                    ],
+                    default=models.Value(False),
+                    output_field=models.BooleanField(),
+                ),
+                stock_state=models.Case(
+                    *[
+                        models.When(pk=product_id, then=models.Value(current_state))
+                        for product_id, (_, current_state) in transitions.items()
+                    ],
+                    default=models.F("stock_state"),
+                    output_field=models.CharField(),
+                ),
+                updated_at=now,
+            )
+            if updated != len(requested):
+                raise ValueError("Stock insuficiente para el producto seleccionado")
+
+            notifications = []
+            for product_id, (previous_state, current_state) in transitions.items():
+                product = locked_products[product_id]
+                product.stock -= requested[product_id]
+                product.in_stock = product.stock > 0
+                product.stock_state = current_state
+                product.updated_at = now
+                product._loaded_stock_state = current_state
+                if previous_state != current_state:
+                    notification = Notification.build_stock_transition(
+                        product, previous_state, current_state
+                    )
+                    if notification is not None:
+                        notifications.append(notification)
+            Notification.objects.bulk_create(notifications, batch_size=500)
+
+        # ``uq_order_local_pickup`` garantiza la unicidad; ante una colisión se
+        # regenera el código dentro de un savepoint para no abortar el pedido.
+        for attempt in range(PICKUP_CODE_ATTEMPTS):
+            pickup_code = generate_pickup_code()
+            try:
+                with transaction.atomic():
+                    order = Order.objects.create(
+                        user=user, local=local, total=total, pickup_code=pickup_code
+                    )
+                break
+            except IntegrityError:
+                # Cualquier otra violación de integridad se propaga sin reintentar.
+                collision = Order.objects.filter(local=local, pickup_code=pickup_code).exists()
+                if not collision or attempt == PICKUP_CODE_ATTEMPTS - 1:
+                    raise
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(
+                    order=order,
+                    product=item["product"],
+                    quantity=item["quantity"],
+                    unit_price=item["product"].price,
+                )
+                for item in items_data
+            ],
+            batch_size=200,
+        )
 
     return order
@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """Paginación por cursor (``created_at < ?``) que sólo se activa con ``?page_size=``.
+
+    Sin el parámetro la respuesta sigue siendo la lista completa que usa el frontend.
+    """
+
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "-created_at"
+
+
+class OptionalIdCursorPagination(OptionalCursorPagination):
+    ordering = "-id"
+
+
+class OptionalLimitOffsetPagination(LimitOffsetPagination):
+    """Paginación ``?limit=&offset=`` opcional para catálogos."""
+
+    default_limit = None
+    max_limit = 200
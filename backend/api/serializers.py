@@ -1,8 +1,11 @@
 from decimal import Decimal
 
-from django.db import transaction
-from django.utils.text import slugify
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Prefetch
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.settings import api_settings
 
 from .models import (
     User,
@@ -16,10 +19,53 @@ from .models import (
     PointBalance,
     Redemption,
     Notification,
+    cached_slugify,
     create_order_with_items,
 )
 
 
+def _only_related(queryset, *related_fields):
+    """Carga todas las columnas propias del modelo y sólo ``related_fields`` de los joins."""
+    own_fields = [field.attname for field in queryset.model._meta.concrete_fields]
+    return queryset.only(*own_fields, *related_fields)
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Resuelve una lista de PKs con una sola consulta en vez de un ``get()`` por elemento."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            try:
+                pks.append(int(item))
+            except (TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+
+        objects = child.get_queryset().in_bulk(pks)
+        for pk in pks:
+            if pk not in objects:
+                child.fail("does_not_exist", pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True)
     email = serializers.EmailField(required=False, allow_blank=True)
@@ -43,13 +89,17 @@ class UserSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         password = validated_data.pop("password", None)
+        update_fields = list(validated_data)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         if password:
             instance.set_password(password)
-        instance.save()
+            update_fields.append("password")
+        if update_fields:
+            instance.save(update_fields=[*update_fields, "updated_at"])
         return instance
 
+
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
@@ -67,9 +117,22 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ("slug", "created_at", "updated_at")
 
 
+class TagSummarySerializer(serializers.ModelSerializer):
+    """Etiqueta reducida para listados; coincide con ``summary_queryset``."""
+
+    class Meta:
+        model = Tag
+        fields = ["id", "name", "slug", "icon", "scope", "accent_color"]
+        read_only_fields = fields
+
+    @classmethod
+    def summary_queryset(cls):
+        return Tag.objects.only(*cls.Meta.fields)
+
+
 class LocalSerializer(serializers.ModelSerializer):
     owner_name = serializers.ReadOnlyField(source="owner.username")
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = BulkPrimaryKeyRelatedField(
         many=True, queryset=Tag.objects.all(), required=False
     )
     tag_details = TagSerializer(source="tags", many=True, read_only=True)
@@ -143,7 +206,70 @@ class LocalSerializer(serializers.ModelSerializer):
             "tags": {"required": False},
         }
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(queryset.select_related("owner"), "owner__username").prefetch_related("tags")
+
+
+class LocalListSerializer(serializers.ModelSerializer):
+    """Ficha reducida de locales para listados (sin mapas embebidos, galería ni wifi)."""
+
+    owner_name = serializers.ReadOnlyField(source="owner.username")
+    tag_details = TagSummarySerializer(source="tags", many=True, read_only=True)
+
+    class Meta:
+        model = Local
+        fields = [
+            "id",
+            "owner",
+            "owner_name",
+            "name",
+            "description",
+            "headline",
+            "highlights",
+            "address",
+            "schedule",
+            "type",
+            "points_rate",
+            "contact_phone",
+            "contact_email",
+            "website_url",
+            "instagram_url",
+            "map_url",
+            "cover_image_url",
+            "tag_details",
+        ]
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return (
+            queryset.select_related("owner")
+            .only(
+                "id",
+                "owner__username",
+                "name",
+                "description",
+                "headline",
+                "highlights",
+                "address",
+                "schedule",
+                "type",
+                "points_rate",
+                "contact_phone",
+                "contact_email",
+                "website_url",
+                "instagram_url",
+                "map_url",
+                "cover_image_url",
+            )
+            .prefetch_related(Prefetch("tags", queryset=TagSummarySerializer.summary_queryset()))
+        )
+
+
 class ProductCategorySerializer(serializers.ModelSerializer):
+    DUPLICATE_NAME_MESSAGE = "Ya existe una categoría con este nombre para ese alcance."
+
     local_name = serializers.ReadOnlyField(source="local.name")
 
     class Meta:
@@ -164,6 +290,10 @@ class ProductCategorySerializer(serializers.ModelSerializer):
             "local": {"required": False},
         }
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(queryset.select_related("local"), "local__name")
+
     def validate(self, attrs):
         local = attrs.get("local", getattr(self.instance, "local", None))
         if local is None:
@@ -178,15 +308,36 @@ class ProductCategorySerializer(serializers.ModelSerializer):
         if not name:
             return attrs
 
-        if ProductCategory.objects.exclude(pk=getattr(self.instance, "pk", None)).filter(
-            slug=slugify(name),
+        slug = cached_slugify(name)
+        if self.instance is None:
+            # La restricción única (local, slug) detecta el duplicado al insertar.
+            if slug:
+                attrs["slug"] = slug
+            return attrs
+
+        if name == self.instance.name and local.pk == self.instance.local_id:
+            return attrs
+
+        if ProductCategory.objects.exclude(pk=self.instance.pk).filter(
+            slug=slug,
             local=local,
         ).exists():
-            raise serializers.ValidationError(
-                {"name": "Ya existe una categoría con este nombre para ese alcance."}
-            )
+            raise serializers.ValidationError({"name": self.DUPLICATE_NAME_MESSAGE})
         return attrs
 
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as exc:
+            # Sólo la colisión (local, slug) es un nombre duplicado; el resto se propaga.
+            slug = validated_data.get("slug")
+            if not slug or not ProductCategory.objects.filter(
+                local=validated_data.get("local"), slug=slug
+            ).exists():
+                raise
+            raise serializers.ValidationError({"name": [self.DUPLICATE_NAME_MESSAGE]}) from exc
+
 
 class ProductSerializer(serializers.ModelSerializer):
     local_name = serializers.ReadOnlyField(source="local.name")
@@ -194,7 +345,7 @@ class ProductSerializer(serializers.ModelSerializer):
     category_slug = serializers.ReadOnlyField(source="category.slug")
     category_tracks_stock = serializers.ReadOnlyField(source="category.tracks_stock")
     stock_state = serializers.CharField(read_only=True)
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = BulkPrimaryKeyRelatedField(
         many=True, queryset=Tag.objects.all(), required=False
     )
     tag_details = TagSerializer(source="tags", many=True, read_only=True)
@@ -244,6 +395,16 @@ class ProductSerializer(serializers.ModelSerializer):
             "display_order": {"min_value": 0, "required": False},
         }
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(
+            queryset.select_related("local", "category"),
+            "local__name",
+            "category__name",
+            "category__slug",
+            "category__tracks_stock",
+        ).prefetch_related("tags")
+
     def validate(self, attrs):
         instance = getattr(self, "instance", None)
         category = attrs.get("category", getattr(instance, "category", None))
@@ -289,12 +450,7 @@ class ProductSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         category = validated_data["category"]
         if not validated_data.get("display_order"):
-            last_order = (
-                Product.objects.filter(category=category)
-                .order_by("-display_order")
-                .values_list("display_order", flat=True)
-                .first()
-            )
+            last_order = Product.objects.filter(category=category).aggregate(last=Max("display_order"))["last"]
             validated_data["display_order"] = (last_order or 0) + 1
 
         tracks_stock = validated_data.get("tracks_stock")
@@ -308,14 +464,60 @@ class ProductSerializer(serializers.ModelSerializer):
         product = super().update(instance, validated_data)
         request = self.context.get("request")
         if request is not None and hasattr(request, "user"):
-            try:
-                user = request.user if request.user.is_authenticated else None
-                Notification.log_product_updated(product, user)
-            except Exception:  # pragma: no cover - evitar fallas en cascada
-                pass
+            user = request.user if request.user.is_authenticated else None
+            # robust=True registra el error en el log sin propagar fallas en cascada.
+            transaction.on_commit(
+                lambda: Notification.log_product_updated(product, user),
+                robust=True,
+            )
         return product
 
 
+class ProductListSerializer(serializers.ModelSerializer):
+    """Representación reducida para el catálogo público de un local."""
+
+    category_name = serializers.CharField(read_only=True)
+    category_slug = serializers.CharField(read_only=True)
+    stock_state = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Product
+        fields = [
+            "id",
+            "local",
+            "name",
+            "description",
+            "price",
+            "category",
+            "category_name",
+            "category_slug",
+            "display_order",
+            "image_url",
+            "in_stock",
+            "is_active",
+            "state",
+            "stock_state",
+        ]
+        read_only_fields = fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.only(
+            "id",
+            "local_id",
+            "name",
+            "description",
+            "price",
+            "category_id",
+            "display_order",
+            "image_url",
+            "in_stock",
+            "is_active",
+            "state",
+            "stock_state",
+        ).annotate(category_name=F("category__name"), category_slug=F("category__slug"))
+
+
 class NotificationSerializer(serializers.ModelSerializer):
     product_name = serializers.ReadOnlyField(source="product.name")
     local_name = serializers.ReadOnlyField(source="local.name")
@@ -339,6 +541,10 @@ class NotificationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(queryset.select_related("product", "local"), "product__name", "local__name")
+
 
 class OrderItemReadSerializer(serializers.ModelSerializer):
     product_name = serializers.ReadOnlyField(source="product.name")
@@ -347,9 +553,13 @@ class OrderItemReadSerializer(serializers.ModelSerializer):
         model = OrderItem
         fields = ["id", "product", "product_name", "quantity", "unit_price"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(queryset.select_related("product"), "product__name")
+
 
 class OrderItemWriteSerializer(serializers.Serializer):
-    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.filter(is_active=True))
+    product = serializers.IntegerField(min_value=1)
     quantity = serializers.IntegerField(min_value=1)
 
 
@@ -386,23 +596,54 @@ class OrderSerializer(serializers.ModelSerializer):
             "local_name",
             "user_name",
         )
+        # La restricción ``uq_order_local_pickup`` ya la aplica la base de datos y
+        # ``create_order_with_items`` reintenta ante colisiones; el validador que DRF
+        # generaría sólo consultaría un código por defecto que luego se descarta.
+        validators = []
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(
+            queryset.select_related("user", "local"), "user__username", "local__name"
+        ).prefetch_related(
+            Prefetch(
+                "items",
+                queryset=OrderItemReadSerializer.setup_eager_loading(OrderItem.objects.all()),
+            )
+        )
+
+    def validate_items_data(self, value):
+        products = (
+            Product.objects.filter(id__in={item["product"] for item in value}, is_active=True)
+            .only("id", "price", "tracks_stock")
+            .in_bulk()
+        )
+        errors = []
+        for item in value:
+            product = products.get(item["product"])
+            if product is None:
+                message = serializers.PrimaryKeyRelatedField.default_error_messages["does_not_exist"]
+                errors.append({"product": [message.format(pk_value=item["product"])]})
+            else:
+                item["product"] = product
+                errors.append({})
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return value
 
     def create(self, validated_data):
         items_data = validated_data.pop("items_data")
         local = validated_data["local"]
         user = self.context["request"].user
 
-        order_items_payload = [
-            {"product": item["product"], "quantity": item["quantity"]}
-            for item in items_data
-        ]
-
         try:
-            order = create_order_with_items(user=user, local=local, items_data=order_items_payload)
+            order = create_order_with_items(user=user, local=local, items_data=items_data)
         except ValueError as exc:
             raise serializers.ValidationError({"items_data": str(exc)}) from exc
 
-        return order
+        # Los productos validados sólo traen id/precio; la respuesta se arma con la
+        # carga anticipada para no consultar cada producto por separado.
+        return self.setup_eager_loading(Order.objects.filter(pk=order.pk)).get()
 
 
 class RewardSerializer(serializers.ModelSerializer):
@@ -425,6 +666,10 @@ class RewardSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(queryset.select_related("local"), "local__name")
+
 
 class PointBalanceSerializer(serializers.ModelSerializer):
     local_name = serializers.ReadOnlyField(source="local.name")
@@ -443,6 +688,10 @@ class PointBalanceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ("updated_at",)
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(queryset.select_related("user", "local"), "user__username", "local__name")
+
 
 class RedemptionSerializer(serializers.ModelSerializer):
     local_name = serializers.ReadOnlyField(source="local.name")
@@ -465,27 +714,29 @@ class RedemptionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ("created_at",)
 
-    def validate(self, attrs):
-        user = attrs.get("user")
-        local = attrs.get("local")
-        points_used = attrs.get("points_used")
-
-        try:
-            balance = PointBalance.objects.get(user=user, local=local)
-        except PointBalance.DoesNotExist as exc:
-            raise serializers.ValidationError("El usuario no tiene puntos en este local.") from exc
-
-        if balance.total < points_used:
-            raise serializers.ValidationError("Puntos insuficientes para canjear.")
-        return attrs
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return _only_related(
+            queryset.select_related("user", "local", "reward"),
+            "user__username",
+            "local__name",
+            "reward__name",
+        )
 
     def create(self, validated_data):
+        user = validated_data["user"]
+        local = validated_data["local"]
+        points_used = validated_data["points_used"]
+
         with transaction.atomic():
-            balance = PointBalance.objects.select_for_update().get(
-                user=validated_data["user"], local=validated_data["local"]
-            )
-            points_used = validated_data["points_used"]
-            balance.total -= points_used
-            balance.save(update_fields=["total", "updated_at"])
+            updated = PointBalance.objects.filter(
+                user=user, local=local, total__gte=points_used
+            ).update(total=F("total") - points_used, updated_at=timezone.now())
+            if not updated:
+                if PointBalance.objects.filter(user=user, local=local).exists():
+                    message = "Puntos insuficientes para canjear."
+                else:
+                    message = "El usuario no tiene puntos en este local."
+                raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
             redemption = Redemption.objects.create(**validated_data)
         return redemption
@@ -1,21 +1,33 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from django import template
 
 register = template.Library()
 
 
-@register.filter(name="length_is")
-def length_is(value: object, expected_length: str | int) -> bool:
-    """Mimic the deprecated ``length_is`` filter used by Jazzmin templates."""
+def _to_int(expected_length: object) -> int | None:
     try:
-        expected = int(expected_length)
+        return int(expected_length)  # type: ignore[call-overload]
     except (TypeError, ValueError):
-        return False
+        return None
 
-    try:
-        actual_length = len(value)  # type: ignore[arg-type]
-    except TypeError:
+
+# Template literals such as ``length_is:"3"`` repeat on every render.
+_literal_to_int = lru_cache(maxsize=128)(_to_int)
+
+
+@register.filter(name="length_is", is_safe=True)
+def length_is(value: object, expected_length: str | int) -> bool:
+    """Mimic the deprecated ``length_is`` filter used by Jazzmin templates."""
+    if isinstance(expected_length, int):
+        expected = expected_length
+    elif isinstance(expected_length, str):
+        expected = _literal_to_int(expected_length)
+    else:
+        expected = _to_int(expected_length)
+    if expected is None or not hasattr(value, "__len__"):
         return False
 
-    return actual_length == expected
+    return len(value) == expected  # type: ignore[arg-type]
@@ -1,7 +1,7 @@
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from api.models import Local, Product, ProductCategory, Order
+from api.models import Local, Notification, Product, ProductCategory, Order
 
 User = get_user_model()
 
@@ -50,3 +50,106 @@ def test_client_can_place_order():
     assert str(order.total) == "6000.00"
     assert order.user == customer
     assert order.status == Order.Status.PENDING
+
+
+@pytest.mark.django_db
+def test_order_decrements_tracked_stock():
+    client = APIClient()
+
+    owner = User.objects.create_user(username="tostador", password="safe123", role="tostaduria")
+    customer = User.objects.create_user(username="comprador", password="pass123", role="cliente")
+    local = Local.objects.create(
+        owner=owner,
+        name="Tostaduría Norte",
+        address="Antofagasta",
+        type="tostaduria",
+        points_rate=0.05,
+    )
+    granos = ProductCategory.objects.create(local=local, name="Granos", tracks_stock=True)
+    bean = Product.objects.create(
+        local=local,
+        name="Grano Huila",
+        price="9000.00",
+        category=granos,
+        stock=6,
+        low_stock_threshold=3,
+    )
+
+    client.force_authenticate(user=customer)
+
+    response = client.post(
+        "/api/orders/",
+        {
+            "local": local.id,
+            "items_data": [
+                {"product": bean.id, "quantity": 2},
+                {"product": bean.id, "quantity": 1},
+            ],
+        },
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert response.data["total"] == "27000.00"
+    assert len(response.data["pickup_code"]) == 8
+    assert len(response.data["items"]) == 2
+    bean.refresh_from_db()
+    assert bean.stock == 3
+    assert bean.in_stock is True
+    assert Notification.objects.filter(product=bean, type=Notification.Types.STOCK_LOW).exists()
+
+    response = client.post(
+        "/api/orders/",
+        {"local": local.id, "items_data": [{"product": bean.id, "quantity": 4}]},
+        format="json",
+    )
+
+    assert response.status_code == 400
+    bean.refresh_from_db()
+    assert bean.stock == 3
+    assert Order.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_order_summary_counts_every_order_per_status():
+    client = APIClient()
+
+    owner = User.objects.create_user(username="cafetero", password="pass123", role="cafeteria")
+    local = Local.objects.create(owner=owner, name="Café Centro", address="Santiago", type="cafeteria")
+    for status in (Order.Status.PENDING, Order.Status.PENDING, Order.Status.COMPLETED):
+        Order.objects.create(user=owner, local=local, total="1000.00", status=status)
+
+    client.force_authenticate(user=owner)
+    response = client.get("/api/orders/summary/")
+
+    assert response.status_code == 200
+    assert response.data["total"] == 3
+    assert response.data["counts"][Order.Status.PENDING] == 2
+    assert response.data["counts"][Order.Status.COMPLETED] == 1
+    assert response.data["active_total"] == 2
+    assert response.data["oldest_pending_minutes"] is not None
+
+
+@pytest.mark.django_db
+def test_order_regenerates_colliding_pickup_code(monkeypatch):
+    client = APIClient()
+
+    owner = User.objects.create_user(username="barista", password="pass123", role="cafeteria")
+    customer = User.objects.create_user(username="comprador", password="pass123", role="cliente")
+    local = Local.objects.create(owner=owner, name="Café Norte", address="Santiago", type="cafeteria")
+    bebidas = ProductCategory.objects.create(name="Bebidas", local=local, tracks_stock=False)
+    product = Product.objects.create(local=local, name="Cortado", price="2500.00", category=bebidas, stock=5)
+    Order.objects.create(user=owner, local=local, total="1000.00", pickup_code="AAAAAAAA")
+
+    codes = iter(["AAAAAAAA", "BBBBBBBB"])
+    monkeypatch.setattr("api.models.generate_pickup_code", lambda: next(codes))
+
+    client.force_authenticate(user=customer)
+    response = client.post(
+        "/api/orders/",
+        {"local": local.id, "items_data": [{"product": product.id, "quantity": 1}]},
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert response.data["pickup_code"] == "BBBBBBBB"
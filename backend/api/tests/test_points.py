@@ -1,7 +1,7 @@
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from api.models import Local, PointBalance
+from api.models import Local, PointBalance, Redemption
 
 User = get_user_model()
 
@@ -34,3 +34,54 @@ def test_points_accumulated_on_endpoints():
 
     record = PointBalance.objects.get(user=user, local=local)
     assert record.total == 5000
+
+
+@pytest.mark.django_db
+def test_points_adjust_never_goes_below_zero():
+    client = APIClient()
+
+    owner = User.objects.create_user(username="dueña", password="safe123", role="cafeteria")
+    user = User.objects.create_user(username="habitual", password="pass123", role="cliente")
+    local = Local.objects.create(
+        owner=owner,
+        name="Café Sur",
+        address="Valdivia",
+        type="cafeteria",
+        points_rate=1,
+    )
+
+    client.force_authenticate(user=user)
+    for _ in range(2):
+        response = client.post("/api/points/accumulate/", {"local": local.id, "amount": 30}, format="json")
+        assert response.status_code == 200
+    assert response.data["balance"]["total"] == 60
+
+    client.force_authenticate(user=owner)
+    response = client.post(
+        "/api/points/adjust/",
+        {"local": local.id, "user": user.id, "delta": -100},
+        format="json",
+    )
+    assert response.status_code == 200
+    assert response.data["total"] == 0
+    assert PointBalance.objects.get(user=user, local=local).total == 0
+
+
+@pytest.mark.django_db
+def test_redemptions_limit_and_cursor_pagination_combine():
+    client = APIClient()
+    owner = User.objects.create_user(username="duena", password="pass123", role="cafeteria")
+    local = Local.objects.create(owner=owner, name="Café Puerto", address="Valparaíso", type="cafeteria")
+    for _ in range(3):
+        Redemption.objects.create(user=owner, local=local, points_used=10)
+
+    client.force_authenticate(user=owner)
+
+    response = client.get("/api/redemptions/?limit=2")
+    assert response.status_code == 200
+    assert len(response.data) == 2
+
+    response = client.get("/api/redemptions/?limit=5&page_size=2")
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 2
+    assert response.data["next"] is not None
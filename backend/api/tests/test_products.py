@@ -1,7 +1,7 @@
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from api.models import Local, Product, ProductCategory
+from api.models import Local, Product, ProductCategory, Tag
 
 User = get_user_model()
 
@@ -99,3 +99,83 @@ def test_grain_product_requires_stock():
     assert response_ok.status_code == 201
     bean = Product.objects.get(id=response_ok.data["id"])
     assert bean.stock == 15
+
+
+@pytest.mark.django_db
+def test_stock_state_is_persisted_and_filterable():
+    client = APIClient()
+
+    owner = User.objects.create_user(username="barista", password="pass123", role="cafeteria")
+    local = Local.objects.create(
+        owner=owner,
+        name="Café Norte",
+        address="Ñuñoa",
+        type="cafeteria",
+        points_rate=0.1,
+    )
+    granos = ProductCategory.objects.create(local=local, name="Granos", tracks_stock=True)
+    product = Product.objects.create(
+        local=local,
+        name="Grano Brasil",
+        price="7000.00",
+        category=granos,
+        stock=10,
+        low_stock_threshold=5,
+        critical_stock_threshold=2,
+    )
+    assert product.stock_state == Product.StockStates.NORMAL
+
+    product.adjust_stock(-6)
+    assert product.stock_state == Product.StockStates.LOW
+    assert Product.objects.get(pk=product.pk).stock_state == Product.StockStates.LOW
+
+    client.force_authenticate(user=owner)
+    response = client.get("/api/products/", {"local": local.id, "stock_state": "low"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data] == [product.id]
+
+    response = client.get("/api/products/", {"local": local.id, "stock_state": "normal"})
+    assert response.data == []
+
+
+@pytest.mark.django_db
+def test_tag_list_answers_not_modified_until_tags_change():
+    client = APIClient()
+    Tag.objects.create(name="Vegano", scope=Tag.Scopes.PRODUCT)
+
+    response = client.get("/api/tags/")
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert "no-cache" in response["Cache-Control"]
+
+    response = client.get("/api/tags/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    Tag.objects.create(name="Sin gluten", scope=Tag.Scopes.PRODUCT)
+    response = client.get("/api/tags/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert len(response.data) == 2
+
+
+@pytest.mark.django_db
+def test_duplicate_category_name_is_rejected_per_local():
+    client = APIClient()
+
+    owner = User.objects.create_user(username="catowner", password="pass123", role="cafeteria")
+    local = Local.objects.create(
+        owner=owner,
+        name="Café Norte",
+        address="Ñuñoa",
+        description="Barra de espresso",
+        type="cafeteria",
+        points_rate=0.1,
+    )
+    client.force_authenticate(user=owner)
+
+    first = client.post("/api/categories/", {"name": "Postres", "local": local.id}, format="json")
+    assert first.status_code == 201
+
+    duplicate = client.post("/api/categories/", {"name": "Postres", "local": local.id}, format="json")
+    assert duplicate.status_code == 400
+    assert "name" in duplicate.data
+    assert ProductCategory.objects.filter(local=local, slug="postres").count() == 1
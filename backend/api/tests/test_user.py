@@ -1,6 +1,7 @@
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from api.models import Local
 
 User = get_user_model()
 
@@ -21,3 +22,20 @@ def test_user_registration_and_login():
 
     assert response.status_code in [200, 201]
 
+
+@pytest.mark.django_db
+def test_username_change_refreshes_locals_listing():
+    client = APIClient()
+    owner = User.objects.create_user(username="tostador", password="pass123", role="cafeteria")
+    Local.objects.create(owner=owner, name="Tostaduría Sur", address="Valdivia", type="tostaduria")
+
+    response = client.get("/api/locals/?view=summary")
+    etag = response["ETag"]
+    assert client.get("/api/locals/?view=summary", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    client.force_authenticate(user=owner)
+    assert client.patch(f"/api/users/{owner.id}/", {"username": "tostador_sur"}, format="json").status_code == 200
+
+    response = client.get("/api/locals/?view=summary", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data[0]["owner_name"] == "tostador_sur"
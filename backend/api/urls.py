@@ -1,4 +1,4 @@
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 
 from .views import (
 	UserViewSet,
@@ -14,7 +14,7 @@ from .views import (
 	RedemptionViewSet,
 )
 
-router = DefaultRouter()
+router = SimpleRouter(trailing_slash=True)
 router.register(r"users", UserViewSet)
 router.register(r"locals", LocalViewSet)
 router.register(r"tags", TagViewSet)
@@ -1,9 +1,11 @@
+import hashlib
 from datetime import timedelta
 
 from django.db import transaction
-from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models import Avg, Case, Count, DurationField, ExpressionWrapper, F, IntegerField, Max, Min, OuterRef, Q, Subquery, Sum, Value, When
 from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
@@ -22,10 +24,13 @@ from .models import (
     Redemption,
     Notification,
 )
+from .pagination import OptionalCursorPagination, OptionalIdCursorPagination
 from .serializers import (
     UserSerializer,
+    LocalListSerializer,
     LocalSerializer,
     TagSerializer,
+    ProductListSerializer,
     ProductSerializer,
     ProductCategorySerializer,
     OrderSerializer,
@@ -37,6 +42,82 @@ from .serializers import (
 )
 
 
+class ConditionalListMixin:
+    """Responde 304 en ``list`` si el listado no cambió desde la última respuesta del cliente.
+
+    El ETag sale de ``Max(updated_at)`` y ``Count`` sobre el queryset filtrado, más lo que
+    agregue ``get_conditional_list_stats`` para datos relacionados que también se muestran;
+    un acierto evita traer las filas y serializarlas. Las respuestas se marcan ``no-cache``
+    para que el navegador revalide siempre y no muestre datos viejos tras crear o editar.
+    """
+
+    conditional_list_per_user = False
+
+    def get_conditional_list_stats(self):
+        return {}
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stats = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"),
+            total=Count("pk", distinct=True),
+            **self.get_conditional_list_stats(),
+        )
+        validator = ":".join(
+            value.isoformat() if hasattr(value, "isoformat") else str(value)
+            for _key, value in sorted(stats.items())
+        )
+        if self.conditional_list_per_user:
+            validator = f"{request.user.pk}:{validator}"
+        etag = f'"{hashlib.md5(validator.encode(), usedforsecurity=False).hexdigest()}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        if self.conditional_list_per_user:
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ("Authorization",))
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+class QueryParamMixin:
+    """Lectura común de ``request.query_params`` para los filtros de los listados."""
+
+    def _int_param(self, name, default=None, minimum=None):
+        value = self.request.query_params.get(name)
+        if not value:
+            return default
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return default
+        if minimum is not None and value < minimum:
+            return default
+        return value
+
+    def _bool_param(self, name):
+        value = (self.request.query_params.get(name) or "").lower()
+        if value == "true":
+            return True
+        if value == "false":
+            return False
+        return None
+
+    def _split_list(self, name):
+        value = self.request.query_params.get(name) or ""
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    def _apply_ordering(self, queryset, *default):
+        return queryset.order_by(*(self._split_list("ordering") or default))
+
+    def _apply_limit(self, queryset):
+        limit = self._int_param("limit", minimum=1)
+        return queryset[:limit] if limit else queryset
+
+
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -48,13 +129,33 @@ class UserViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
 
-class LocalViewSet(viewsets.ModelViewSet):
-    queryset = Local.objects.select_related("owner").prefetch_related("tags").all()
+class LocalViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = LocalSerializer.setup_eager_loading(Local.objects.all())
     serializer_class = LocalSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def get_conditional_list_stats(self):
+        return {
+            "owner_modified": Max("owner__updated_at"),
+            "tags_modified": Max("tags__updated_at"),
+            "tag_links": Count("tags"),
+        }
+
+    def _is_summary_view(self) -> bool:
+        return self.action == "list" and self.request.query_params.get("view") == "summary"
+
+    def get_serializer_class(self):
+        if self._is_summary_view():
+            return LocalListSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        if self._is_summary_view():
+            return LocalListSerializer.setup_eager_loading(Local.objects.all())
+        return super().get_queryset()
+
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
@@ -70,15 +171,34 @@ class TagViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class ProductViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Product.objects.select_related("local", "category").prefetch_related("tags")
-    )
+class ProductViewSet(ConditionalListMixin, QueryParamMixin, viewsets.ModelViewSet):
+    queryset = ProductSerializer.setup_eager_loading(Product.objects.all())
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    throttle_scope = None  # ``reorder`` lo fija por acción.
+
+    def get_conditional_list_stats(self):
+        stats = {
+            "category_modified": Max("category__updated_at"),
+            "local_modified": Max("local__updated_at"),
+        }
+        if not self._is_catalog_view():
+            stats.update(tags_modified=Max("tags__updated_at"), tag_links=Count("tags"))
+        return stats
+
+    def _is_catalog_view(self) -> bool:
+        return self.action == "list" and self.request.query_params.get("view") == "catalog"
+
+    def get_serializer_class(self):
+        if self._is_catalog_view():
+            return ProductListSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        if self._is_catalog_view():
+            queryset = ProductListSerializer.setup_eager_loading(Product.objects.all())
+        else:
+            queryset = super().get_queryset()
         params = self.request.query_params
 
         search = params.get("search")
@@ -99,56 +219,23 @@ class ProductViewSet(viewsets.ModelViewSet):
 
         stock_state = params.get("stock_state")
         if stock_state:
-            state_filter = self._build_stock_state_filter(stock_state)
-            if state_filter is not None:
-                queryset = queryset.filter(state_filter)
-
-        in_stock = params.get("in_stock")
-        if in_stock:
-            if in_stock.lower() == "true":
-                queryset = queryset.filter(in_stock=True)
-            elif in_stock.lower() == "false":
-                queryset = queryset.filter(in_stock=False)
-
-        ordering = params.get("ordering")
-        if ordering:
-            queryset = queryset.order_by(*ordering.split(","))
-        else:
-            queryset = queryset.order_by("category_id", "display_order", "name")
-
-        return queryset
-
-    @staticmethod
-    def _build_stock_state_filter(value: str):
-        state = value.lower()
-        if state == "low":
-            return (
-                Q(tracks_stock=True)
-                & Q(stock__gt=F("critical_stock_threshold"))
-                & Q(stock__lte=F("low_stock_threshold"))
-                & Q(stock__gt=0)
-            )
-        if state == "critical":
-            return (
-                Q(tracks_stock=True)
-                & Q(stock__gt=0)
-                & Q(stock__lte=F("critical_stock_threshold"))
-            )
-        if state == "out":
-            return (
-                Q(tracks_stock=True, stock__lte=0)
-                | Q(tracks_stock=False, in_stock=False)
-            )
-        if state == "available":
-            return Q(tracks_stock=False, in_stock=True)
-        if state == "normal":
-            return (
-                Q(tracks_stock=True)
-                & Q(stock__gt=F("low_stock_threshold"))
-            )
-        return None
-
-    @action(detail=False, methods=["post"], permission_classes=[permissions.IsAuthenticated], url_path="reorder")
+            stock_state = stock_state.lower()
+            if stock_state in Product.StockStates.values:
+                queryset = queryset.filter(stock_state=stock_state)
+
+        in_stock = self._bool_param("in_stock")
+        if in_stock is not None:
+            queryset = queryset.filter(in_stock=in_stock)
+
+        return self._apply_ordering(queryset, "category_id", "display_order", "name")
+
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path="reorder",
+        throttle_scope="reorder",
+    )
     def reorder(self, request):
         category_id = request.data.get("category")
         order = request.data.get("order", [])
@@ -158,21 +245,42 @@ class ProductViewSet(viewsets.ModelViewSet):
         if not isinstance(order, list) or not all(isinstance(item, int) for item in order):
             return Response({"detail": "order debe ser una lista de IDs numéricos."}, status=status.HTTP_400_BAD_REQUEST)
 
-        products = Product.objects.filter(category_id=category_id, id__in=order)
-        if products.count() != len(order):
-            return Response({"detail": "Algunos productos no pertenecen a la categoría indicada."}, status=status.HTTP_400_BAD_REQUEST)
-
-        with transaction.atomic():
-            for index, product_id in enumerate(order):
-                Product.objects.filter(id=product_id).update(display_order=index)
+        if len(set(order)) != len(order):
+            return Response({"detail": "order contiene IDs repetidos."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if order:
+            products = Product.objects.filter(category_id=category_id, id__in=order)
+            with transaction.atomic():
+                updated = products.update(
+                    display_order=Case(
+                        *[When(id=product_id, then=Value(index)) for index, product_id in enumerate(order)],
+                        output_field=IntegerField(),
+                    ),
+                    updated_at=timezone.now(),
+                )
+                if updated != len(order):
+                    # Sólo en el camino de error: identifica qué IDs no corresponden.
+                    invalid_ids = sorted(set(order) - set(products.values_list("id", flat=True)))
+                    transaction.set_rollback(True)
+                    return Response(
+                        {
+                            "detail": "Algunos productos no pertenecen a la categoría indicada.",
+                            "invalid_ids": invalid_ids,
+                        },
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
 
         return Response({"detail": "Orden actualizado."}, status=status.HTTP_200_OK)
 
 
-class ProductCategoryViewSet(viewsets.ModelViewSet):
-    queryset = ProductCategory.objects.select_related("local").all()
+class ProductCategoryViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = ProductCategorySerializer.setup_eager_loading(ProductCategory.objects.all())
     serializer_class = ProductCategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    conditional_list_per_user = True
+
+    def get_conditional_list_stats(self):
+        return {"local_modified": Max("local__updated_at")}
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -191,18 +299,24 @@ class ProductCategoryViewSet(viewsets.ModelViewSet):
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = None  # ``mark_all_read`` lo fija por acción.
+    pagination_class = OptionalCursorPagination
 
-    def get_queryset(self):
-        base_queryset = Notification.objects.select_related("product", "local").order_by("-created_at")
+    def _scope_notifications(self):
+        """Notificaciones visibles para el usuario, sin joins ni orden (apto para UPDATE)."""
         user = self.request.user
         if not user.is_authenticated:
             return Notification.objects.none()
 
+        queryset = Notification.objects.all()
         if user.is_superuser or getattr(user, "role", None) == User.Roles.ADMIN:
-            return base_queryset
+            return queryset
 
         local_ids = Local.objects.filter(owner=user).values_list("id", flat=True)
-        return base_queryset.filter(Q(local_id__in=local_ids) | Q(user=user))
+        return queryset.filter(Q(local_id__in=local_ids) | Q(user=user))
+
+    def get_queryset(self):
+        return NotificationSerializer.setup_eager_loading(self._scope_notifications()).order_by("-created_at")
 
     @action(detail=True, methods=["post"])
     def mark_read(self, request, pk=None):
@@ -211,17 +325,18 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
 
-    @action(detail=False, methods=["post"], url_path="mark-all-read")
+    @action(detail=False, methods=["post"], url_path="mark-all-read", throttle_scope="mark_all_read")
     def mark_all_read(self, request):
-        queryset = self.get_queryset().filter(is_read=False)
+        queryset = self._scope_notifications().filter(is_read=False)
         updated = queryset.update(is_read=True, read_at=timezone.now())
         return Response({"updated": updated})
 
 
-class OrderViewSet(viewsets.ModelViewSet):
-    queryset = Order.objects.select_related("user", "local").prefetch_related("items__product").all()
+class OrderViewSet(QueryParamMixin, viewsets.ModelViewSet):
+    queryset = OrderSerializer.setup_eager_loading(Order.objects.all())
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -231,23 +346,14 @@ class OrderViewSet(viewsets.ModelViewSet):
         if local_id:
             queryset = queryset.filter(local_id=local_id)
 
-        status_filter = params.get("status")
-        if status_filter:
-            valid_status = {choice[0] for choice in Order.Status.choices}
-            requested = [value.strip() for value in status_filter.split(",") if value.strip()]
-            requested = [value for value in requested if value in valid_status]
-            if requested:
-                queryset = queryset.filter(status__in=requested)
+        requested = [value for value in self._split_list("status") if value in Order.STATUS_VALUES]
+        if requested:
+            queryset = queryset.filter(status__in=requested)
 
-        since_minutes = params.get("since")
+        since_minutes = self._int_param("since", minimum=1)
         if since_minutes:
-            try:
-                minutes_value = int(since_minutes)
-            except (TypeError, ValueError):
-                minutes_value = None
-            if minutes_value and minutes_value > 0:
-                threshold = timezone.now() - timedelta(minutes=minutes_value)
-                queryset = queryset.filter(created_at__gte=threshold)
+            threshold = timezone.now() - timedelta(minutes=since_minutes)
+            queryset = queryset.filter(created_at__gte=threshold)
 
         search_term = params.get("search")
         if search_term:
@@ -256,13 +362,7 @@ class OrderViewSet(viewsets.ModelViewSet):
                 | Q(pickup_code__icontains=search_term)
             )
 
-        ordering = params.get("ordering")
-        if ordering:
-            queryset = queryset.order_by(*[value.strip() for value in ordering.split(",") if value.strip()])
-        else:
-            queryset = queryset.order_by("-created_at")
-
-        return queryset
+        return self._apply_ordering(queryset, "-created_at")
 
     def perform_create(self, serializer):
         serializer.save()
@@ -271,8 +371,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     def update_status(self, request, pk=None):
         order = self.get_object()
         new_status = request.data.get("status")
-        valid_status = dict(Order.Status.choices)
-        if new_status not in valid_status:
+        if new_status not in Order.STATUS_VALUES:
             return Response({"detail": "Estado inválido."}, status=400)
         order.update_status(new_status)
         serializer = self.get_serializer(order)
@@ -281,9 +380,19 @@ class OrderViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
     def summary(self, request):
         queryset = self.get_queryset()
-        counts = {status: 0 for status, _ in Order.Status.choices}
-        for row in queryset.values("status").annotate(total=Count("id")):
-            counts[row["status"]] = row["total"]
+        duration = ExpressionWrapper(F("updated_at") - F("created_at"), output_field=DurationField())
+        stats = queryset.aggregate(
+            **{
+                f"count_{value}": Count("id", filter=Q(status=value))
+                for value in Order.Status.values
+            },
+            oldest_pending=Min("created_at", filter=Q(status=Order.Status.PENDING)),
+            avg_preparation=Avg(
+                duration, filter=Q(status__in=[Order.Status.PREPARING, Order.Status.READY])
+            ),
+            avg_completion=Avg(duration, filter=Q(status=Order.Status.COMPLETED)),
+        )
+        counts = {value: stats[f"count_{value}"] for value in Order.Status.values}
 
         active_states = {
             Order.Status.PENDING,
@@ -292,33 +401,20 @@ class OrderViewSet(viewsets.ModelViewSet):
         }
         now = timezone.now()
 
-        pending_order = queryset.filter(status=Order.Status.PENDING).order_by("created_at").first()
         oldest_pending_minutes = None
-        if pending_order:
+        if stats["oldest_pending"] is not None:
             oldest_pending_minutes = max(
-                (now - pending_order.created_at).total_seconds() / 60.0,
+                (now - stats["oldest_pending"]).total_seconds() / 60.0,
                 0.0,
             )
 
-        prep_queryset = queryset.filter(status__in=[Order.Status.PREPARING, Order.Status.READY])
-        prep_duration = prep_queryset.annotate(
-            duration=ExpressionWrapper(
-                F("updated_at") - F("created_at"), output_field=DurationField()
-            )
-        ).aggregate(avg=Avg("duration"))
         avg_prep_minutes = None
-        if prep_duration["avg"] is not None:
-            avg_prep_minutes = prep_duration["avg"].total_seconds() / 60.0
+        if stats["avg_preparation"] is not None:
+            avg_prep_minutes = stats["avg_preparation"].total_seconds() / 60.0
 
-        completion_queryset = queryset.filter(status=Order.Status.COMPLETED)
-        completion_duration = completion_queryset.annotate(
-            duration=ExpressionWrapper(
-                F("updated_at") - F("created_at"), output_field=DurationField()
-            )
-        ).aggregate(avg=Avg("duration"))
         avg_completion_minutes = None
-        if completion_duration["avg"] is not None:
-            avg_completion_minutes = completion_duration["avg"].total_seconds() / 60.0
+        if stats["avg_completion"] is not None:
+            avg_completion_minutes = stats["avg_completion"].total_seconds() / 60.0
 
         data = {
             "total": sum(counts.values()),
@@ -341,67 +437,70 @@ class OrderViewSet(viewsets.ModelViewSet):
                 Order.Status.READY,
             ]
         ).order_by("created_at")
-        limit = request.query_params.get("limit")
-        if limit:
-            try:
-                limit_value = int(limit)
-            except (TypeError, ValueError):
-                limit_value = None
-            if limit_value and limit_value > 0:
-                queryset = queryset[:limit_value]
+        queryset = self._apply_limit(queryset)
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
 
 class OrderItemViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = OrderItem.objects.select_related("order", "product").all()
+    queryset = OrderItemReadSerializer.setup_eager_loading(OrderItem.objects.all())
     serializer_class = OrderItemReadSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalIdCursorPagination
 
 
-class RewardViewSet(viewsets.ModelViewSet):
-    queryset = Reward.objects.select_related("local").all()
+class RewardViewSet(ConditionalListMixin, QueryParamMixin, viewsets.ModelViewSet):
+    queryset = RewardSerializer.setup_eager_loading(Reward.objects.all())
     serializer_class = RewardSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_list_per_user = True
 
-    def get_queryset(self):
-        queryset = Reward.objects.select_related("local").annotate(
-            redemption_count=Count("redemptions")
-        )
-        params = self.request.query_params
-        user = self.request.user
+    def get_conditional_list_stats(self):
+        return {"local_modified": Max("local__updated_at"), "redemptions": Count("redemptions")}
 
-        if not (user.is_superuser or getattr(user, "role", None) == User.Roles.ADMIN):
-            local_ids = Local.objects.filter(owner=user).values_list("id", flat=True)
-            queryset = queryset.filter(local_id__in=local_ids)
+    @staticmethod
+    def _base_rewards():
+        # Subconsulta correlacionada sobre el índice de ``reward_id``: evita el
+        # LEFT JOIN + GROUP BY por todas las columnas que genera ``Count("redemptions")``.
+        redemption_count = (
+            Redemption.objects.filter(reward=OuterRef("pk"))
+            .order_by()
+            .values("reward")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return RewardSerializer.setup_eager_loading(Reward.objects.all()).annotate(
+            redemption_count=Coalesce(Subquery(redemption_count, output_field=IntegerField()), 0)
+        )
 
+    def _filter_rewards(self, queryset):
+        params = self.request.query_params
         local_id = params.get("local")
         if local_id:
             queryset = queryset.filter(local_id=local_id)
 
-        active_param = params.get("active")
-        if active_param:
-            if active_param.lower() == "true":
-                queryset = queryset.filter(active=True)
-            elif active_param.lower() == "false":
-                queryset = queryset.filter(active=False)
-
         search = params.get("search")
         if search:
             queryset = queryset.filter(
                 Q(name__icontains=search) | Q(description__icontains=search)
             )
 
-        ordering = params.get("ordering")
-        if ordering:
-            fields = [value.strip() for value in ordering.split(",") if value.strip()]
-            if fields:
-                queryset = queryset.order_by(*fields)
-        else:
-            queryset = queryset.order_by("points_required", "name")
+        return self._apply_ordering(queryset, "points_required", "name")
 
-        return queryset
+    def get_queryset(self):
+        queryset = self._base_rewards()
+        user = self.request.user
+
+        if not (user.is_superuser or getattr(user, "role", None) == User.Roles.ADMIN):
+            local_ids = Local.objects.filter(owner=user).values_list("id", flat=True)
+            queryset = queryset.filter(local_id__in=local_ids)
+
+        active = self._bool_param("active")
+        if active is not None:
+            queryset = queryset.filter(active=active)
+
+        return self._filter_rewards(queryset)
 
     def _ensure_local_permission(self, local_id):
         user = self.request.user
@@ -437,50 +536,28 @@ class RewardViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="available", permission_classes=[permissions.IsAuthenticated])
     def available(self, request):
-        params = request.query_params
-        queryset = (
-            Reward.objects.select_related("local")
-            .annotate(redemption_count=Count("redemptions"))
-            .filter(active=True)
-        )
-
-        local_id = params.get("local")
-        if local_id:
-            queryset = queryset.filter(local_id=local_id)
-
-        search = params.get("search")
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(description__icontains=search)
-            )
-
-        ordering = params.get("ordering")
-        if ordering:
-            fields = [value.strip() for value in ordering.split(",") if value.strip()]
-            if fields:
-                queryset = queryset.order_by(*fields)
-        else:
-            queryset = queryset.order_by("points_required", "name")
-
+        queryset = self._filter_rewards(self._base_rewards().filter(active=True))
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
 
-class PointBalanceViewSet(viewsets.ModelViewSet):
-    queryset = PointBalance.objects.select_related("user", "local").all()
+class PointBalanceViewSet(QueryParamMixin, viewsets.ModelViewSet):
+    queryset = PointBalanceSerializer.setup_eager_loading(PointBalance.objects.all())
     serializer_class = PointBalanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = None  # ``accumulate`` lo fija por acción.
+    # ``?limit=`` ya recorta la lista sin envolverla; el frontend espera un arreglo.
+    pagination_class = None
 
     def get_queryset(self):
         user = self.request.user
         if not user.is_authenticated:
             return PointBalance.objects.none()
 
-        queryset = PointBalance.objects.select_related("user", "local")
+        queryset = PointBalanceSerializer.setup_eager_loading(PointBalance.objects.all())
 
         if not (user.is_superuser or getattr(user, "role", None) == User.Roles.ADMIN):
-            local_ids = Local.objects.filter(owner=user).values_list("id", flat=True)
-            queryset = queryset.filter(Q(user=user) | Q(local_id__in=local_ids))
+            queryset = queryset.filter(Q(user=user) | Q(local__owner=user))
 
         params = self.request.query_params
         local_id = params.get("local")
@@ -494,40 +571,18 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
                 | Q(local__name__icontains=search)
             )
 
-        min_points = params.get("min_points")
+        min_points = self._int_param("min_points")
         if min_points is not None:
-            try:
-                queryset = queryset.filter(total__gte=int(min_points))
-            except (TypeError, ValueError):
-                pass
+            queryset = queryset.filter(total__gte=min_points)
 
-        max_points = params.get("max_points")
+        max_points = self._int_param("max_points")
         if max_points is not None:
-            try:
-                queryset = queryset.filter(total__lte=int(max_points))
-            except (TypeError, ValueError):
-                pass
-
-        ordering = params.get("ordering")
-        if ordering:
-            fields = [value.strip() for value in ordering.split(",") if value.strip()]
-            if fields:
-                queryset = queryset.order_by(*fields)
-        else:
-            queryset = queryset.order_by("-total", "user__username")
+            queryset = queryset.filter(total__lte=max_points)
 
-        limit_param = params.get("limit")
-        if limit_param is not None:
-            try:
-                limit_value = int(limit_param)
-                if limit_value > 0:
-                    queryset = queryset[:limit_value]
-            except (TypeError, ValueError):
-                pass
+        queryset = self._apply_ordering(queryset, "-total", "user__username")
+        return self._apply_limit(queryset)
 
-        return queryset
-
-    @action(detail=False, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @action(detail=False, methods=["post"], permission_classes=[permissions.IsAuthenticated], throttle_scope="accumulate")
     def accumulate(self, request):
         local_id = request.data.get("local")
         amount = request.data.get("amount")
@@ -543,7 +598,7 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
             return Response({"detail": "amount debe ser numérico."}, status=400)
 
         try:
-            local = Local.objects.get(id=local_id)
+            local = Local.objects.only("id", "points_rate").get(id=local_id)
         except Local.DoesNotExist:
             return Response({"detail": "Local no encontrado."}, status=404)
 
@@ -559,9 +614,7 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
             self._ensure_owner_access(local.id)
 
         points_earned = int(amount * local.points_rate)
-        record, _ = PointBalance.objects.get_or_create(user=target_user, local=local)
-        record.total += max(points_earned, 0)
-        record.save(update_fields=["total", "updated_at"])
+        record = PointBalance.apply_delta(target_user, local, max(points_earned, 0))
 
         serializer = self.get_serializer(record)
         return Response({"earned": points_earned, "balance": serializer.data})
@@ -609,9 +662,7 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
 
         self._ensure_owner_access(local.id)
 
-        record, _ = PointBalance.objects.get_or_create(user=target_user, local=local)
-        record.total = max(record.total + delta_value, 0)
-        record.save(update_fields=["total", "updated_at"])
+        record = PointBalance.apply_delta(target_user, local, delta_value)
 
         serializer = self.get_serializer(record)
         return Response(serializer.data)
@@ -621,13 +672,13 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset()
         user = self.request.user
 
-        total_points = queryset.aggregate(total=Coalesce(Sum("total"), 0))[
-            "total"
-        ]
-        active_customers = queryset.values("user_id").distinct().count()
+        balance_stats = queryset.aggregate(
+            total_points=Coalesce(Sum("total"), 0),
+            active_customers=Count("user_id", distinct=True),
+        )
 
-        reward_queryset = Reward.objects.select_related("local")
-        redemption_queryset = Redemption.objects.select_related("reward", "local", "user")
+        reward_queryset = Reward.objects.all()
+        redemption_queryset = Redemption.objects.all()
 
         if not (user.is_superuser or getattr(user, "role", None) == User.Roles.ADMIN):
             local_ids = Local.objects.filter(owner=user).values_list("id", flat=True)
@@ -640,13 +691,7 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
             reward_queryset = reward_queryset.filter(local_id=local_id)
             redemption_queryset = redemption_queryset.filter(local_id=local_id)
 
-        since_days_param = params.get("since_days")
-        try:
-            since_days = int(since_days_param)
-        except (TypeError, ValueError):
-            since_days = 30
-        if since_days <= 0:
-            since_days = 30
+        since_days = self._int_param("since_days", default=30, minimum=1)
 
         window_start = timezone.now() - timedelta(days=since_days)
         window_redemptions = redemption_queryset.filter(created_at__gte=window_start)
@@ -654,20 +699,19 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
         window_stats = window_redemptions.aggregate(
             total=Count("id"), points=Coalesce(Sum("points_used"), 0)
         )
+        reward_stats = reward_queryset.aggregate(
+            total=Count("id"), active=Count("id", filter=Q(active=True))
+        )
 
-        top_customers_queryset = queryset.select_related("user", "local").order_by(
-            "-total", "user__username"
-        )[:5]
-        top_customers = [
-            {
-                "user_id": balance.user_id,
-                "user_name": balance.user.username,
-                "local_id": balance.local_id,
-                "local_name": balance.local.name,
-                "total_points": balance.total,
-            }
-            for balance in top_customers_queryset
-        ]
+        top_customers = list(
+            queryset.order_by("-total", "user__username").values(
+                "user_id",
+                "local_id",
+                user_name=F("user__username"),
+                local_name=F("local__name"),
+                total_points=F("total"),
+            )[:5]
+        )
 
         top_rewards_rows = (
             window_redemptions.exclude(reward_id__isnull=True)
@@ -685,10 +729,10 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
         ]
 
         data = {
-            "total_points": total_points,
-            "active_customers": active_customers,
-            "active_rewards": reward_queryset.filter(active=True).count(),
-            "total_rewards": reward_queryset.count(),
+            "total_points": balance_stats["total_points"],
+            "active_customers": balance_stats["active_customers"],
+            "active_rewards": reward_stats["active"],
+            "total_rewards": reward_stats["total"],
             "redemptions_last_window": window_stats["total"],
             "points_redeemed_last_window": window_stats["points"],
             "top_customers": top_customers,
@@ -700,21 +744,21 @@ class PointBalanceViewSet(viewsets.ModelViewSet):
         return Response(data)
 
 
-class RedemptionViewSet(viewsets.ModelViewSet):
-    queryset = Redemption.objects.select_related("user", "local", "reward").all()
+class RedemptionViewSet(QueryParamMixin, viewsets.ModelViewSet):
+    queryset = RedemptionSerializer.setup_eager_loading(Redemption.objects.all())
     serializer_class = RedemptionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
 
     def get_queryset(self):
         user = self.request.user
         if not user.is_authenticated:
             return Redemption.objects.none()
 
-        queryset = Redemption.objects.select_related("user", "local", "reward")
+        queryset = RedemptionSerializer.setup_eager_loading(Redemption.objects.all())
 
         if not (user.is_superuser or getattr(user, "role", None) == User.Roles.ADMIN):
-            local_ids = Local.objects.filter(owner=user).values_list("id", flat=True)
-            queryset = queryset.filter(Q(user=user) | Q(local_id__in=local_ids))
+            queryset = queryset.filter(Q(user=user) | Q(local__owner=user))
 
         params = self.request.query_params
         local_id = params.get("local")
@@ -725,15 +769,10 @@ class RedemptionViewSet(viewsets.ModelViewSet):
         if reward_id:
             queryset = queryset.filter(reward_id=reward_id)
 
-        since_days_param = params.get("since_days")
-        if since_days_param:
-            try:
-                since_days = int(since_days_param)
-                if since_days > 0:
-                    threshold = timezone.now() - timedelta(days=since_days)
-                    queryset = queryset.filter(created_at__gte=threshold)
-            except (TypeError, ValueError):
-                pass
+        since_days = self._int_param("since_days", minimum=1)
+        if since_days:
+            threshold = timezone.now() - timedelta(days=since_days)
+            queryset = queryset.filter(created_at__gte=threshold)
 
         search = params.get("search")
         if search:
@@ -743,21 +782,15 @@ class RedemptionViewSet(viewsets.ModelViewSet):
                 | Q(reward__name__icontains=search)
             )
 
-        ordering = params.get("ordering")
-        if ordering:
-            fields = [value.strip() for value in ordering.split(",") if value.strip()]
-            if fields:
-                queryset = queryset.order_by(*fields)
-        else:
-            queryset = queryset.order_by("-created_at")
+        return self._apply_ordering(queryset, "-created_at")
 
-        limit_param = params.get("limit")
-        if limit_param is not None:
-            try:
-                limit_value = int(limit_param)
-                if limit_value > 0:
-                    queryset = queryset[:limit_value]
-            except (TypeError, ValueError):
-                pass
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
 
-        return queryset
+        # ``?limit=`` recorta la lista plana sólo cuando no se pide paginación.
+        serializer = self.get_serializer(self._apply_limit(queryset), many=True)
+        return Response(serializer.data)
@@ -1,11 +1,15 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'tu-clave-secreta'
-DEBUG = True
-ALLOWED_HOSTS = ['*']
+# DEBUG guarda cada consulta SQL en memoria por petición; en desarrollo: DJANGO_DEBUG=1.
+DEBUG = os.environ.get('DJANGO_DEBUG', '0') == '1'
+ALLOWED_HOSTS = [
+    host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',') if host
+]
 
 INSTALLED_APPS = [
     'jazzmin',
@@ -41,7 +45,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOWED_ORIGINS = [
+    origin for origin in os.environ.get('DJANGO_CORS_ALLOWED_ORIGINS', '').split(',') if origin
+]
+CORS_ALLOW_ALL_ORIGINS = DEBUG
 
 ROOT_URLCONF = 'coffeefy.urls'
 
@@ -72,7 +79,17 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.OptionalLimitOffsetPagination',
+    # Sólo limita las acciones que declaran ``throttle_scope`` (escrituras en lote).
+    'DEFAULT_THROTTLE_CLASSES': [
+        'rest_framework.throttling.ScopedRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'reorder': '20/min',
+        'accumulate': '60/min',
+        'mark_all_read': '30/min',
+    },
 }
 
 SIMPLE_JWT = {
@@ -87,6 +104,8 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
         'TEST': {
             'NAME': None,
             'SERIALIZE': False,
@@ -280,7 +280,7 @@ export default function ClientWalletPage() {
     setLocalsLoading(true);
     setLocalsError(null);
     try {
-      const response = await apiFetch<Local[]>("/api/locals/", {
+      const response = await apiFetch<Local[]>("/api/locals/?view=summary", {
         token: accessToken ?? undefined,
       });
       const filtered = response
@@ -316,6 +316,7 @@ export default function ClientWalletPage() {
       try {
         const params = new URLSearchParams();
         params.set("local", String(localId));
+        params.set("view", "catalog");
         params.set("in_stock", "true");
         params.set("ordering", "category,display_order,name");
 
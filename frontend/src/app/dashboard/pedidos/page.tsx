@@ -152,7 +152,7 @@ export default function OrdersOperationsPage() {
 
     const fetchLocals = async () => {
       try {
-        const response = await apiFetch<Local[]>("/api/locals/", {
+        const response = await apiFetch<Local[]>("/api/locals/?view=summary", {
           token: accessToken ?? undefined,
         });
         setLocals(response);
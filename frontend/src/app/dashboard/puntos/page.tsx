@@ -115,7 +115,7 @@ export default function LoyaltyDashboardPage() {
 
     const fetchLocals = async () => {
       try {
-        const response = await apiFetch<Local[]>("/api/locals/", {
+        const response = await apiFetch<Local[]>("/api/locals/?view=summary", {
           token: accessToken ?? undefined,
         });
         setLocals(response);